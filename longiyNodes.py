@@ -29,13 +29,26 @@ from bpy.props import (
 
 def node_center(context):
     from mathutils import Vector
-    loc = Vector((0.0, 0.0))
     node_selected = context.selected_nodes
-    if node_selected:
-        for node in node_selected:
-            loc += node.location
-        loc /= len(node_selected)
-    return loc
+    if not node_selected:
+        return Vector((0.0, 0.0))
+    # Plain float sums, avoids a Vector temporary per node
+    x = y = 0.0
+    for node in node_selected:
+        loc = node.location
+        x += loc[0]
+        y += loc[1]
+    scale = 1.0 / len(node_selected)
+    return Vector((x * scale, y * scale))
+
+
+# Updated node type dictionary for Blender 4.4
+_NODE_TYPE_STRING = {
+    "ShaderNodeTree": "ShaderNodeGroup",
+    "CompositorNodeTree": "CompositorNodeGroup",
+    "TextureNodeTree": "TextureNodeGroup",
+    "GeometryNodeTree": "GeometryNodeGroup",
+}
 
 
 def node_template_add(context, filepath, node_group, ungroup, report):
@@ -51,56 +64,64 @@ def node_template_add(context, filepath, node_group, ungroup, report):
         report({'ERROR'}, "No node tree available")
         return
 
+    node_type_string = _NODE_TYPE_STRING.get(node_tree.bl_rna.identifier)
+    if node_type_string is None:
+        report({'ERROR'}, "Unsupported node tree type")
+        return
+
     with bpy.data.libraries.load(filepath, link=False) as (data_from, data_to):
         assert(node_group in data_from.node_groups)
         data_to.node_groups = [node_group]
     node_group = data_to.node_groups[0]
 
+    # Check before creating the node, instead of adding and removing it again
+    if node_group.bl_rna.identifier != node_tree.bl_rna.identifier:
+        report({'WARNING'}, "Incompatible node type")
+        return
+
     # add node!
     center = node_center(context)
 
-    for node in node_tree.nodes:
-        node.select = False
-
-    # Updated node type dictionary for Blender 4.4
-    node_type_string = {
-        "ShaderNodeTree": "ShaderNodeGroup",
-        "CompositorNodeTree": "CompositorNodeGroup",
-        "TextureNodeTree": "TextureNodeGroup",
-        "GeometryNodeTree": "GeometryNodeGroup",
-    }[type(node_tree).__name__]
+    bpy.ops.node.select_all(action='DESELECT')
 
     node = node_tree.nodes.new(type=node_type_string)
     node.node_tree = node_group
 
-    is_fail = (node.node_tree is None)
-    if is_fail:
-        report({'WARNING'}, "Incompatible node type")
-
     node.select = True
     node_tree.nodes.active = node
     node.location = center
 
-    if is_fail:
-        node_tree.nodes.remove(node)
-    else:
-        if ungroup:
-            bpy.ops.node.group_ungroup()
+    if ungroup:
+        bpy.ops.node.group_ungroup()
 
 
 # -----------------------------------------------------------------------------
 # Node Template Prefs
 
+_PREF_ATTR = {
+    "GeometryNodeTree": "search_path_geometry",
+    "ShaderNodeTree": "search_path_shader",
+    "CompositorNodeTree": "search_path_compositing",
+    "TextureNodeTree": "search_path_texture",
+}
+
+
+def _get_prefs(context):
+    # Not cached, reloading the preferences frees and rebuilds this data
+    # without re-registering the add-on.
+    return context.preferences.addons[__name__].preferences
+
+
 def node_search_path(context, ui_type):
-    preferences = context.preferences
-    addon_prefs = preferences.addons[__name__].preferences
-    node_paths = {
-        "GeometryNodeTree": addon_prefs.search_path_geometry,
-        "ShaderNodeTree": addon_prefs.search_path_shader,
-        "CompositorNodeTree": addon_prefs.search_path_compositing,
-        "TextureNodeTree": addon_prefs.search_path_texture,
-    }
-    return node_paths.get(ui_type)
+    attr = _PREF_ATTR.get(ui_type)
+    if attr is None:
+        return None
+    return getattr(_get_prefs(context), attr, None)
+
+
+def node_search_path_update(self, context):
+    # Search paths changed, drop the per-editor template lists
+    node_template_cache._cache.clear()
 
 
 class NodeTemplatePrefs(AddonPreferences):
@@ -109,18 +130,22 @@ class NodeTemplatePrefs(AddonPreferences):
     search_path_geometry: StringProperty(
         name="Geometry nodes path",
         subtype='DIR_PATH',
+        update=node_search_path_update,
     )
     search_path_shader: StringProperty(
         name="Shader nodes path",
         subtype='DIR_PATH',
+        update=node_search_path_update,
     )
     search_path_compositing: StringProperty(
         name="Compositing nodes path",
         subtype='DIR_PATH',
+        update=node_search_path_update,
     )
     search_path_texture: StringProperty(
         name="Texture nodes path",
         subtype='DIR_PATH',
+        update=node_search_path_update,
     )
 
     def draw(self, context):
@@ -162,22 +187,101 @@ class NODE_OT_template_add(Operator):
 # -----------------------------------------------------------------------------
 # Node menu list
 
+_NODE_UI_TYPES = frozenset((
+    "GeometryNodeTree",
+    "ShaderNodeTree",
+    "CompositorNodeTree",
+    "TextureNodeTree",
+))
+
+# Node editor type found for areas that aren't node editors themselves,
+# {area pointer: ui_type}, cleared by node_template_watch.
+_ui_type_cache = {}
+
+
 def get_ui_type_from_context(context):
     # Helper function to get the current node editor type
-    if not context.area:
+    area = context.area
+    if not area:
         return None
     
-    if context.area.ui_type in {"GeometryNodeTree", "ShaderNodeTree", 
-                               "CompositorNodeTree", "TextureNodeTree",
-                               }:
-        return context.area.ui_type
+    ui_type = area.ui_type
+    if ui_type in _NODE_UI_TYPES:
+        return ui_type
     
+    area_key = area.as_pointer()
+    try:
+        return _ui_type_cache[area_key]
+    except KeyError:
+        pass
+
     # Handle case where node editor is open but we're looking at the wrong area
-    for area in context.screen.areas:
-        if area.type == 'NODE_EDITOR':
-            return area.ui_type
+    ui_type = None
+    for area_iter in context.screen.areas:
+        if area_iter.type == 'NODE_EDITOR':
+            ui_type = area_iter.ui_type
+            break
     
-    return None
+    # Not found isn't cached, so a node editor opened later is picked up at once
+    if ui_type is not None:
+        if len(_ui_type_cache) >= 16:
+            _ui_type_cache.clear()
+        _ui_type_cache[area_key] = ui_type
+    return ui_type
+
+
+# Scanned template directories, persisted across sessions:
+# {dirpath: (dir_mtime_ns, {filepath: (file_mtime_ns, [group_name, ...])})}
+_template_dir_cache = {}
+
+# Bump when the layout of _template_dir_cache changes, older caches are discarded
+TEMPLATE_CACHE_VERSION = 2
+
+
+def template_cache_filepath():
+    return os.path.join(
+        bpy.utils.user_resource('CONFIG', path="longiyNodes", create=True),
+        "template_cache.pickle",
+    )
+
+
+def template_cache_load():
+    import pickle
+    try:
+        with open(template_cache_filepath(), "rb") as fh:
+            data = pickle.load(fh)
+    except Exception:
+        # Missing or unreadable cache, templates get rescanned on demand
+        return
+    if isinstance(data, tuple) and len(data) == 2 and data[0] == TEMPLATE_CACHE_VERSION:
+        _template_dir_cache.update(data[1])
+
+
+def template_cache_save():
+    import pickle
+    try:
+        with open(template_cache_filepath(), "wb") as fh:
+            pickle.dump(
+                (TEMPLATE_CACHE_VERSION, _template_dir_cache),
+                fh,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+    except Exception:
+        # Not persisted, templates get rescanned next session
+        pass
+
+
+def template_probe_blend(filepath):
+    # Return the public node group names in a blend file, None if it can't be read
+    try:
+        # Only data_from is read, leaving data_to empty links nothing
+        with bpy.data.libraries.load(filepath, link=True, assets_only=False) as (data_from, data_to):
+            return sorted(
+                group_name for group_name in data_from.node_groups
+                if not group_name.startswith("_")
+            )
+    except Exception:
+        return None
 
 
 def node_template_cache(context, *, reload=False):
@@ -186,78 +290,96 @@ def node_template_cache(context, *, reload=False):
         return []
     
     dirpath = node_search_path(context, ui_type)
-    if not dirpath or not os.path.exists(dirpath):
+    if not dirpath:
         return []
 
-    # Cache variables for each node type
-    if ui_type == "GeometryNodeTree":
-        if node_template_cache._node_cache_geometry_path != dirpath:
-            reload = True
-        node_cache = node_template_cache._node_cache_geometry
-    elif ui_type == "ShaderNodeTree":
-        if node_template_cache._node_cache_shader_path != dirpath:
-            reload = True
-        node_cache = node_template_cache._node_cache_shader
-    elif ui_type == "CompositorNodeTree":
-        if node_template_cache._node_cache_compositing_path != dirpath:
-            reload = True
-        node_cache = node_template_cache._node_cache_compositing
-    elif ui_type == "TextureNodeTree":
-        if node_template_cache._node_cache_texture_path != dirpath:
-            reload = True
-        node_cache = node_template_cache._node_cache_texture
-
-    else:
-        return []
+    # Entries are dropped by node_search_path_update when a search path changes
+    # and by node_template_watch when the directory changes on disk,
+    # so a cached list is returned without touching the file system.
+    if not reload:
+        cached = node_template_cache._cache.get(ui_type)
+        # Preferences reloaded from disk change the path without an update callback
+        if cached is not None and cached[0] == dirpath:
+            return cached[2]
+
+    # A missing directory raises FileNotFoundError here, no separate exists() check
+    dir_mtime_ns = os.stat(dirpath).st_mtime_ns
+    # Files overwritten in place don't change the directory mtime,
+    # so each file's mtime is checked before reusing its cached groups.
+    dir_cache = None if reload else _template_dir_cache.get(dirpath)
+    files_prev = dir_cache[1] if dir_cache is not None else {}
+    with os.scandir(dirpath) as it:
+        # Sort files once up front, group names are sorted per file,
+        # so the flattened list below needs no further sorting.
+        entries = sorted(
+            (
+                entry for entry in it
+                if entry.name.endswith(".blend") and entry.is_file()
+            ),
+            key=lambda entry: entry.path,
+        )
+
+    files = {}
+    for entry in entries:
+        filepath = entry.path
+        try:
+            file_mtime_ns = entry.stat().st_mtime_ns
+        except OSError:
+            # Removed since the directory was listed
+            continue
+        file_prev = files_prev.get(filepath)
+        if file_prev is not None and file_prev[0] == file_mtime_ns:
+            files[filepath] = file_prev
+            continue
+        group_names = template_probe_blend(filepath)
+        if group_names is not None:
+            files[filepath] = (file_mtime_ns, group_names)
+
+    if dir_cache != (dir_mtime_ns, files):
+        _template_dir_cache[dirpath] = (dir_mtime_ns, files)
+        template_cache_save()
+
+    node_cache = [
+        (group_name, filepath)
+        for filepath, (_file_mtime_ns, group_names) in files.items()
+        for group_name in group_names
+    ]
+    node_template_cache._cache[ui_type] = (dirpath, dir_mtime_ns, node_cache)
 
-    if reload:
-        node_cache = []
-    if node_cache:
-        return node_cache
+    return node_cache
 
-    if not os.path.exists(dirpath):
-        return []
 
-    for fn in os.listdir(dirpath):
-        if fn.endswith(".blend"):
-            filepath = os.path.join(dirpath, fn)
-            try:
-                with bpy.data.libraries.load(filepath) as (data_from, data_to):
-                    for group_name in data_from.node_groups:
-                        if not group_name.startswith("_"):
-                            node_cache.append((group_name, filepath))
-            except Exception:
-                # Skip files that can't be opened
-                continue
+# Initialize cache, {ui_type: (dirpath, dir_mtime_ns, [(group_name, filepath), ...])}
+node_template_cache._cache = {}
 
-    node_cache = sorted(node_cache)
-
-    # Update the appropriate cache
-    if ui_type == "GeometryNodeTree":
-        node_template_cache._node_cache_geometry = node_cache
-        node_template_cache._node_cache_geometry_path = dirpath
-    elif ui_type == "ShaderNodeTree":
-        node_template_cache._node_cache_shader = node_cache
-        node_template_cache._node_cache_shader_path = dirpath
-    elif ui_type == "CompositorNodeTree":
-        node_template_cache._node_cache_compositing = node_cache
-        node_template_cache._node_cache_compositing_path = dirpath
-    elif ui_type == "TextureNodeTree":
-        node_template_cache._node_cache_texture = node_cache
-        node_template_cache._node_cache_texture_path = dirpath
 
-    return node_cache
+NODE_TEMPLATE_WATCH_INTERVAL = 2.0
+
 
+def node_template_watch():
+    # Timer, drops stale node template state:
+    # editor types looked up from other areas, which may have changed since,
+    # and cached template lists whose search path or directory changed.
+    _ui_type_cache.clear()
 
-# Initialize cache variables
-node_template_cache._node_cache_geometry = []
-node_template_cache._node_cache_geometry_path = ""
-node_template_cache._node_cache_shader = []
-node_template_cache._node_cache_shader_path = ""
-node_template_cache._node_cache_compositing = []
-node_template_cache._node_cache_compositing_path = ""
-node_template_cache._node_cache_texture = []
-node_template_cache._node_cache_texture_path = ""
+    node_cache_all = node_template_cache._cache
+    if node_cache_all:
+        addon_prefs = _get_prefs(bpy.context)
+        for ui_type in tuple(node_cache_all.keys()):
+            dirpath = getattr(addon_prefs, _PREF_ATTR[ui_type], None)
+            cached_path, cached_mtime_ns, _node_cache = node_cache_all[ui_type]
+            if cached_path != dirpath:
+                del node_cache_all[ui_type]
+                continue
+            # Compare against the mtime this list was built from, other editors
+            # sharing the directory may have rescanned it since.
+            try:
+                dir_mtime_ns = os.stat(dirpath).st_mtime_ns
+            except (OSError, TypeError):
+                dir_mtime_ns = None
+            if cached_mtime_ns != dir_mtime_ns:
+                del node_cache_all[ui_type]
+    return NODE_TEMPLATE_WATCH_INTERVAL
 
 
 class NODE_MT_template_add(Menu):
@@ -276,10 +398,6 @@ class NODE_MT_template_add(Menu):
             layout.label(text="Set search dir in the addon-prefs")
             return
 
-        if not os.path.exists(dirpath):
-            layout.label(text="Directory doesn't exist", icon='ERROR')
-            return
-
         try:
             node_items = node_template_cache(context)
             if not node_items:
@@ -294,6 +412,8 @@ class NODE_MT_template_add(Menu):
                 props.filepath = filepath
                 props.group_name = group_name
                 
+        except FileNotFoundError:
+            layout.label(text="Directory doesn't exist", icon='ERROR')
         except Exception as ex:
             layout.label(text=repr(ex), icon='ERROR')
 
@@ -317,10 +437,21 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
 
+    template_cache_load()
+    bpy.app.timers.register(
+        node_template_watch,
+        first_interval=NODE_TEMPLATE_WATCH_INTERVAL,
+        persistent=True,
+    )
+
     bpy.types.NODE_MT_add.append(add_node_button)
 
 
 def unregister():
+    node_template_cache._cache.clear()
+    if bpy.app.timers.is_registered(node_template_watch):
+        bpy.app.timers.unregister(node_template_watch)
+
     for cls in classes:
         bpy.utils.unregister_class(cls)
 